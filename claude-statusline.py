@@ -11,33 +11,66 @@ Generates a status line displaying:
 
 import contextlib
 import io
-import json
+import mmap
 import os
 import re
 import sys
 import time
-from datetime import datetime
-from typing import Optional, Tuple, Dict, Any
-from urllib.parse import urlparse
+from typing import Optional, Tuple, Dict, Any, Iterator
 
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+# Use orjson when available: it is noticeably faster than the standard library
+# and parses bytes directly. Both expose loads() and JSONDecodeError.
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
 
 # Configuration constants
 CONTEXT_LIMIT = 200_000 # 200k tokens
 MAX_STDIN_SIZE = 10_485_760  # 10MB
+TRANSCRIPT_TAIL_WINDOW = 262_144  # 256KB read from the end of the transcript
+TRANSCRIPT_END_TYPES = frozenset(("summary", "file-history-snapshot"))
+# Raw bytes searched in the transcript to find these records before decoding them
+TRANSCRIPT_END_NEEDLES = tuple(f'"{record_type}"'.encode() for record_type in TRANSCRIPT_END_TYPES)
 CONTEXT_HIGH_THRESHOLD = 90.0
 CONTEXT_MEDIUM_THRESHOLD = 65.0
 COLOR_HIGH = 31  # Red
 COLOR_MEDIUM = 33  # Orange
 COLOR_NONE = 0  # No color
-
-
-def validate_stdin_input(input_data: str) -> None:
+# Color of each 5% bucket of context usage, up to 100%. Exact as long as the
+# thresholds above are multiples of 5.
+CONTEXT_COLOR_BY_BUCKET = tuple(
+    COLOR_HIGH if bucket * 5 > CONTEXT_HIGH_THRESHOLD
+    else COLOR_MEDIUM if bucket * 5 > CONTEXT_MEDIUM_THRESHOLD
+    else COLOR_NONE
+    for bucket in range(21)
+)
+CONTEXT_LIMIT_TXT = f"{CONTEXT_LIMIT:,}"  # Formatted once for the status line
+GIT_HEAD_REF_PREFIX = b"ref: refs/heads/"
+GIT_HEAD_REF_PREFIX_LEN = len(GIT_HEAD_REF_PREFIX)
+CLAUDE_DIR = os.path.expanduser(os.path.join("~", ".claude"))  # Resolved once
+SETTINGS_PATH = os.path.join(CLAUDE_DIR, "settings.json")
+SETTINGS_CACHE_SUFFIX = ".statusline-cache"  # Cache file stored next to settings.json
+URL_SCHEME_RE = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*://")
+DAEMON_SOCKET_PATH = os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR") or CLAUDE_DIR, "claude-statusline.sock"
+)
+DAEMON_CLIENT_TIMEOUT = 5.0  # Seconds allowed to a client to send its input
+TRANSCRIPT_SCAN_CACHE_SIZE = 8  # Transcripts whose last scan is kept in memory
+
+# Result of a transcript scan: (assistant_message, user_message, conversation_ended)
+TranscriptScan = Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], bool]
+
+# Last scan per transcript path: (size, mtime_ns, result), least recently used first
+_TRANSCRIPT_SCAN_CACHE: Dict[str, Tuple[int, int, TranscriptScan]] = {}
+
+
+def validate_stdin_input(input_data: bytes) -> None:
     """
     Validate stdin input for security reasons.
 
     Args:
-        input_data: Raw input string from stdin
+        input_data: Raw input bytes from stdin
 
     Raises:
         SystemExit: If input validation fails
@@ -47,12 +80,12 @@ def validate_stdin_input(input_data: str) -> None:
         sys.exit(1)
 
 
-def parse_json_input(input_data: str) -> Dict[str, Any]:
+def parse_json_input(input_data: bytes) -> Dict[str, Any]:
     """
     Parse and validate JSON input from stdin.
 
     Args:
-        input_data: Raw JSON string from stdin
+        input_data: Raw JSON bytes from stdin, decoded by the JSON parser itself
 
     Returns:
         Parsed JSON data dictionary
@@ -61,14 +94,14 @@ def parse_json_input(input_data: str) -> Dict[str, Any]:
         SystemExit: If JSON parsing fails
     """
     try:
-        data = json.loads(input_data)
+        data = _json.loads(input_data)
         required_keys = ["model", "workspace", "transcript_path"]
         for key in required_keys:
             if key not in data:
                 print(f"Error: Missing required key '{key}' in JSON input")
                 sys.exit(1)
         return data
-    except json.JSONDecodeError as e:
+    except (_json.JSONDecodeError, UnicodeDecodeError) as e:
         print(f"Error JSON parsing: {e}")
         sys.exit(1)
 
@@ -93,44 +126,247 @@ def extract_base_host(value: Optional[str]) -> Optional[str]:
     if not candidate:
         return None
 
-    if not re.match(r"^[a-zA-Z][a-zA-Z0-9+.-]*://", candidate):
-        candidate = f"https://{candidate}"
+    # Cheap substring test first: most values are a bare host without scheme
+    if "://" in candidate and URL_SCHEME_RE.match(candidate):
+        rest = candidate.partition("://")[2]
+    else:
+        rest = candidate
 
-    parsed = urlparse(candidate)
-    if parsed.netloc:
-        return parsed.netloc
+    # Same result as urlparse().netloc, without building a ParseResult
+    host = rest.split("/", 1)[0].split("?", 1)[0].split("#", 1)[0]
+    if host:
+        return host
 
-    if parsed.path and (stripped_path := parsed.path.lstrip("/")):
+    # No host part (e.g. "/api.example.com"): use the first path segment
+    if stripped_path := rest.split("?", 1)[0].split("#", 1)[0].lstrip("/"):
         return stripped_path.split("/", 1)[0]
 
     return None
 
 
-def get_git_branch() -> str:
+def get_git_branch(repo_dir: str = ".") -> str:
     """
     Extract current Git branch name from .git/HEAD.
 
+    Args:
+        repo_dir: Directory inside the repository; the first .git found
+            walking up from it is used, as git itself does
+
     Returns:
-        Git branch name formatted with emoji, or empty string if not in a git repo
+        Git branch name formatted with emoji, short commit hash when HEAD is
+        detached, or empty string if not in a git repo
     """
-    if not os.path.exists(".git"):
-        return ""
-
-    try:
-        with open(".git/HEAD", "r") as f:
-            ref = f.read().strip()
-            if ref.startswith("ref: refs/heads/"):
-                return f" (🌿 {ref.replace('ref: refs/heads/', '')})"
-    except (OSError, IOError):
-        pass
+    directory = os.path.abspath(repo_dir)
+    while True:
+        # A single open() both checks for the repository and reads HEAD
+        try:
+            with open(os.path.join(directory, ".git", "HEAD"), "rb", buffering=0) as f:
+                head = f.read(256).strip()
+            break
+        except FileNotFoundError:
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                return ""
+            directory = parent
+        except (OSError, IOError):
+            # .git exists but is not a readable directory (e.g. a worktree file)
+            return ""
+
+    if head[:GIT_HEAD_REF_PREFIX_LEN] == GIT_HEAD_REF_PREFIX:
+        return f" (🌿 {head[GIT_HEAD_REF_PREFIX_LEN:].decode('utf-8', 'replace')})"
+
+    # Detached HEAD contains the commit hash (SHA-1 or SHA-256) itself
+    if len(head) in (40, 64) and not head.strip(b"0123456789abcdef"):
+        return f" (🌿 {head[:7].decode('ascii')})"
 
     return ""
 
 
+def _iter_records_reverse(
+    mm: mmap.mmap, needle: bytes, lo: int, hi: int, reject: Optional[bytes] = None
+) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+    """
+    Yield the JSON records of the transcript lines containing a needle, last first.
+
+    Lines are located with mmap.rfind(), so the bytes in between are only
+    examined by C code and only matching lines are decoded.
+
+    Args:
+        mm: Memory-mapped transcript
+        needle: Bytes the raw line must contain
+        lo: Start of the first line that may be returned
+        hi: Offset where the search stops (a line start or the end of the file)
+        reject: Bytes that make a line skipped without decoding it
+
+    Yields:
+        Tuples of (line_start, line_end, record); lines that are not a JSON object are skipped
+    """
+    json_loads = _json.loads
+    decode_error = _json.JSONDecodeError
+
+    while True:
+        pos = mm.rfind(needle, lo, hi)
+        if pos < 0:
+            return
+
+        newline = mm.rfind(b"\n", lo, pos)
+        line_start = newline + 1 if newline >= 0 else lo
+        line_end = mm.find(b"\n", pos, hi)
+        if line_end < 0:
+            line_end = hi
+        hi = line_start
+
+        if reject is not None and mm.find(reject, line_start, line_end) >= 0:
+            continue
+        try:
+            record = json_loads(mm[line_start:line_end])
+        except decode_error:
+            continue
+        if isinstance(record, dict):
+            yield line_start, line_end, record
+
+
+def _scan_transcript_tail(transcript_path: str, start: int) -> TranscriptScan:
+    """
+    Scan the transcript backwards for the latest exchange.
+
+    The latest assistant message is only searched down to an offset. The user
+    message that prompted it is searched back to the start of the file, as it
+    may sit far behind the tool results of an agentic turn.
+
+    Args:
+        transcript_path: Path to the transcript file
+        start: Offset where the search for the assistant message stops; a line
+            cut by it is ignored
+
+    Returns:
+        Tuple of (assistant_message, user_message, conversation_ended), where the
+        assistant message is None when not found after the offset, and the user
+        message is None when not found before the assistant message
+    """
+    answer = None
+    question = None
+    ended = False
+
+    with open(transcript_path, "rb") as f:
+        # mmap cannot map an empty file
+        if os.fstat(f.fileno()).st_size <= start:
+            return answer, question, ended
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            lo = start
+            if start > 0 and mm[start - 1:start] != b"\n":
+                # Skip the line cut by the start offset
+                lo = mm.find(b"\n", start) + 1
+                if lo == 0:
+                    return answer, question, ended
+
+            # Find latest assistant message with usage info
+            answer_start = answer_end = lo
+            for line_start, line_end, record in _iter_records_reverse(mm, b'"assistant"', lo, size):
+                message = record.get("message")
+                if record.get("type") == "assistant" and message is not None and "usage" in message:
+                    answer = record
+                    answer_start, answer_end = line_start, line_end
+                    break
+
+            # Summary messages after it mean the conversation ended
+            ended = any(
+                record.get("type") in TRANSCRIPT_END_TYPES
+                for needle in TRANSCRIPT_END_NEEDLES
+                for _, _, record in _iter_records_reverse(mm, needle, answer_end, size)
+            )
+
+            # Find the latest user message before this assistant message
+            if answer is not None:
+                # Tool results are user records too: skip them before decoding
+                for _, _, record in _iter_records_reverse(
+                        mm, b'"user"', 0, answer_start, reject=b'"toolUseResult"'):
+                    if (record.get("type") == "user" and
+                        "message" in record and
+                        "toolUseResult" not in record):
+                        question = record
+                        break
+
+    return answer, question, ended
+
+
+def _scan_transcript(transcript_path: str, size: int) -> TranscriptScan:
+    """
+    Scan the tail window of the transcript, widening it once if no answer is found.
+
+    Args:
+        transcript_path: Path to the transcript file
+        size: Size of the transcript file
+
+    Returns:
+        Same tuple as _scan_transcript_tail
+    """
+    start = max(0, size - TRANSCRIPT_TAIL_WINDOW)
+    answer, question, ended = _scan_transcript_tail(transcript_path, start)
+    if answer is None and start > 0:
+        # Rare: no answer in the window, retry with a wider one
+        start = max(0, size - 2 * TRANSCRIPT_TAIL_WINDOW)
+        answer, question, ended = _scan_transcript_tail(transcript_path, start)
+    return answer, question, ended
+
+
+def _scan_transcript_cached(transcript_path: str, st: os.stat_result) -> TranscriptScan:
+    """
+    Scan the transcript, reusing the previous scan of the same file when possible.
+
+    A long-running process (see --daemon) mostly sees the same transcript again,
+    either unchanged or with lines appended since: the cached result is returned
+    as is, or only the appended bytes are scanned.
+
+    Args:
+        transcript_path: Path to the transcript file
+        st: Current stat of the transcript file
+
+    Returns:
+        Same tuple as _scan_transcript_tail
+    """
+    size = st.st_size
+    cached = _TRANSCRIPT_SCAN_CACHE.pop(transcript_path, None)
+    result = None
+
+    if cached is not None:
+        cached_size, cached_mtime_ns, cached_result = cached
+        if size == cached_size and st.st_mtime_ns == cached_mtime_ns:
+            result = cached_result
+        elif cached_size < size <= cached_size + TRANSCRIPT_TAIL_WINDOW:
+            # Appended bytes can only be scanned alone if they start a new line
+            with open(transcript_path, "rb") as f:
+                f.seek(max(0, cached_size - 1))
+                resumable = cached_size == 0 or f.read(1) == b"\n"
+            if resumable:
+                answer, question, ended = _scan_transcript_tail(transcript_path, cached_size)
+                if answer is None:
+                    # No new answer: the previous one still stands
+                    result = (cached_result[0], cached_result[1], cached_result[2] or ended)
+                else:
+                    result = (answer, question, ended)
+
+    if result is None:
+        result = _scan_transcript(transcript_path, size)
+
+    _TRANSCRIPT_SCAN_CACHE[transcript_path] = (size, st.st_mtime_ns, result)
+    if len(_TRANSCRIPT_SCAN_CACHE) > TRANSCRIPT_SCAN_CACHE_SIZE:
+        # Drop the least recently used transcript
+        del _TRANSCRIPT_SCAN_CACHE[next(iter(_TRANSCRIPT_SCAN_CACHE))]
+    return result
+
+
 def parse_transcript_usage(transcript_path: str, initial_model: str) -> Tuple[int, float, float, bool, str]:
     """
     Parse transcript file to extract usage information.
 
+    The latest assistant message is searched in the last TRANSCRIPT_TAIL_WINDOW
+    bytes, whatever the transcript size; the window is doubled once if it holds no
+    answer. The user message that prompted it is searched back to the file start.
+    Scans are cached per transcript for the lifetime of the process.
+
     Args:
         transcript_path: Path to the transcript file
         initial_model: Initial model name from input data
@@ -145,78 +381,99 @@ def parse_transcript_usage(transcript_path: str, initial_model: str) -> Tuple[in
     final_model = initial_model
 
     try:
-        with open(transcript_path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-            is_running = len(lines) > 0
-
-            # Read file in reverse order to find latest relevant messages
-            for idx in range(len(lines) - 1, -1, -1):
-                line = lines[idx].strip()
-                if not line:
-                    continue
-
-                try:
-                    obj = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-
-                # Skip summary messages and check if conversation ended
-                if obj.get("type") in ["summary", "file-history-snapshot"]:
-                    is_running = False
-                    continue
-
-                # Find latest assistant message with usage info
-                if (obj.get("type") == "assistant" and
-                    "message" in obj and
-                    "usage" in obj["message"]):
-
-                    usage = obj["message"]["usage"]
-                    input_tokens = usage.get("input_tokens", 0)
-                    cache_creation_input_tokens = usage.get("cache_creation_input_tokens", 0)
-                    cache_read_input_tokens = usage.get("cache_read_input_tokens", 0)
-                    output_tokens = usage.get("output_tokens", 0)
-
-                    context_used_tokens = (
-                        input_tokens + cache_creation_input_tokens +
-                        cache_read_input_tokens + output_tokens
-                    )
-
-                    answer_timestamp = obj.get("timestamp", answer_timestamp)
-
-                    # Update model if available in message
-                    if obj["message"].get("model"):
-                        final_model = obj["message"]["model"]
-
-                    # Check if conversation ended
-                    if obj["message"].get("stop_reason") == "end_turn":
-                        is_running = False
-
-                    # Find the latest user message before this assistant message
-                    for j in range(idx - 1, -1, -1):
-                        prev_line = lines[j].strip()
-                        if not prev_line:
-                            continue
-
-                        try:
-                            prev_obj = json.loads(prev_line)
-                        except json.JSONDecodeError:
-                            continue
-
-                        if (prev_obj.get("type") == "user" and
-                            "message" in prev_obj and
-                            "toolUseResult" not in prev_obj):
-                            question_timestamp = prev_obj.get("timestamp", question_timestamp)
-                            break
-
-                    break  # We have all information needed
-
-    except (OSError, IOError, json.JSONDecodeError):
+        st = os.stat(transcript_path)
+        is_running = st.st_size > 0
+
+        answer, question, ended = _scan_transcript_cached(transcript_path, st)
+
+        if ended:
+            is_running = False
+
+        if answer is not None:
+            usage = answer["message"]["usage"]
+            input_tokens = usage.get("input_tokens", 0)
+            cache_creation_input_tokens = usage.get("cache_creation_input_tokens", 0)
+            cache_read_input_tokens = usage.get("cache_read_input_tokens", 0)
+            output_tokens = usage.get("output_tokens", 0)
+
+            context_used_tokens = (
+                input_tokens + cache_creation_input_tokens +
+                cache_read_input_tokens + output_tokens
+            )
+
+            answer_timestamp = answer.get("timestamp", answer_timestamp)
+
+            # Update model if available in message
+            if answer["message"].get("model"):
+                final_model = answer["message"]["model"]
+
+            # Check if conversation ended
+            if answer["message"].get("stop_reason") == "end_turn":
+                is_running = False
+
+            if question is not None:
+                question_timestamp = question.get("timestamp", question_timestamp)
+            else:
+                # No prompt found: report no duration rather than comparing the
+                # answer timestamp with the current time
+                question_timestamp = answer_timestamp
+
+    except (OSError, IOError, _json.JSONDecodeError):
         # If we can't read the transcript, return default values
         pass
 
     return context_used_tokens, answer_timestamp, question_timestamp, is_running, final_model
 
 
+def _iso_to_epoch(value: str) -> Optional[float]:
+    """
+    Convert a UTC timestamp as written in transcripts to Unix time.
+
+    Only the fixed layout "YYYY-MM-DDTHH:MM:SS[.fff]Z" is handled, without
+    building datetime objects.
+
+    Args:
+        value: ISO 8601 timestamp
+
+    Returns:
+        Seconds since the epoch, or None if the timestamp has another layout
+        or an out of range field
+    """
+    if (len(value) < 20 or value[-1] != "Z" or value[4] != "-" or value[7] != "-" or
+            value[10] != "T" or value[13] != ":" or value[16] != ":"):
+        return None
+    fraction = value[20:-1]
+    if len(value) > 20 and (value[19] != "." or not fraction.isdigit()):
+        return None
+
+    fields = (value[0:4], value[5:7], value[8:10], value[11:13], value[14:16], value[17:19])
+    if not all(field.isdigit() for field in fields):
+        return None
+    year, month, day, hour, minute, second = map(int, fields)
+
+    # Reject out of range fields rather than compute a wrong epoch (:60 is a leap second)
+    if not 1 <= month <= 12 or hour > 23 or minute > 59 or second > 60:
+        return None
+    if month == 2:
+        month_days = 29 if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0) else 28
+    else:
+        month_days = 30 if month in (4, 6, 9, 11) else 31
+    if not 1 <= day <= month_days or year < 1:
+        return None
+
+    # Days since 1970-01-01 in the proleptic Gregorian calendar (days_from_civil)
+    y = year - (month <= 2)
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    days = era * 146097 + yoe * 365 + yoe // 4 - yoe // 100 + doy - 719468
+
+    seconds = days * 86400 + hour * 3600 + minute * 60 + second
+    if fraction:
+        return seconds + int(fraction) / 10 ** len(fraction)
+    return float(seconds)
+
+
 def calculate_response_duration(answer_timestamp: Any, question_timestamp: Any) -> float:
     """
     Calculate response duration between question and answer timestamps.
@@ -230,6 +487,14 @@ def calculate_response_duration(answer_timestamp: Any, question_timestamp: Any)
     """
     try:
         if isinstance(answer_timestamp, str) and isinstance(question_timestamp, str):
+            answer_epoch = _iso_to_epoch(answer_timestamp)
+            question_epoch = _iso_to_epoch(question_timestamp)
+            if answer_epoch is not None and question_epoch is not None:
+                return answer_epoch - question_epoch
+
+            # Other ISO 8601 layouts (offsets, no trailing Z...)
+            # datetime is only imported here, off the common path
+            from datetime import datetime
             answer_dt = datetime.fromisoformat(answer_timestamp.replace("Z", "+00:00"))
             question_dt = datetime.fromisoformat(question_timestamp.replace("Z", "+00:00"))
             return (answer_dt - question_dt).total_seconds()
@@ -251,11 +516,56 @@ def get_context_color(percentage: float) -> int:
     Returns:
         ANSI color code
     """
-    if percentage > CONTEXT_HIGH_THRESHOLD:
-        return COLOR_HIGH
-    elif percentage > CONTEXT_MEDIUM_THRESHOLD:
-        return COLOR_MEDIUM
-    return COLOR_NONE
+    # Bucket b holds percentages in (5 * (b - 1), 5 * b]
+    return CONTEXT_COLOR_BY_BUCKET[min(int(-(-percentage // 5)), 20)]
+
+
+def _read_settings_base_url(settings_path: str) -> Optional[str]:
+    """
+    Read the base host from the settings file, through a cache keyed on its mtime.
+
+    The extracted host is stored next to the settings file, so the JSON is only
+    parsed again when the settings file changes.
+
+    Args:
+        settings_path: Path to Claude settings.json
+
+    Returns:
+        Base host string or None
+    """
+    try:
+        st = os.stat(settings_path)
+    except (OSError, IOError):
+        return None
+
+    cache_key = f"{st.st_mtime_ns}:{st.st_size}"
+    cache_path = settings_path + SETTINGS_CACHE_SUFFIX
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            key, _, cached_url = f.read().partition("\n")
+        if key == cache_key:
+            return cached_url or None
+    except (OSError, IOError, UnicodeDecodeError):
+        pass
+
+    try:
+        with open(settings_path, "rb") as f:
+            settings = _json.loads(f.read())
+        base_url = extract_base_host(settings.get("anthropic_base_url"))
+    except (OSError, IOError, _json.JSONDecodeError):
+        return None
+
+    # Write to a temporary file first so a concurrent reader never sees a partial cache
+    tmp_path = f"{cache_path}.{os.getpid()}"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(f"{cache_key}\n{base_url or ''}")
+        os.replace(tmp_path, cache_path)
+    except (OSError, IOError):
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+
+    return base_url
 
 
 def get_base_url() -> Optional[str]:
@@ -266,31 +576,30 @@ def get_base_url() -> Optional[str]:
         Base URL string or None
     """
     # Prioritize environment variable
-    env_url = os.getenv("ANTHROPIC_BASE_URL")
+    env_url = os.environ.get("ANTHROPIC_BASE_URL")
     base_url = extract_base_host(env_url)
 
     if base_url is None:
         # Fallback to settings file
-        settings_path = os.path.expanduser("~/.claude/settings.json")
-        if os.path.exists(settings_path):
-            try:
-                with open(settings_path, "r", encoding="utf-8") as f:
-                    settings = json.load(f)
-                base_url = extract_base_host(settings.get("anthropic_base_url"))
-            except (OSError, IOError, json.JSONDecodeError):
-                pass
+        base_url = _read_settings_base_url(SETTINGS_PATH)
 
     return base_url
 
 
-# Main execution starts here
-def main() -> None:
+def build_status_line(input_data: bytes) -> str:
     """
-    Main function to generate and print the status line.
+    Build the status line from the JSON sent by Claude Code.
+
+    Args:
+        input_data: Raw JSON bytes
+
+    Returns:
+        Formatted status line
+
+    Raises:
+        SystemExit: If input validation or parsing fails
     """
-    # Read and validate input
-    input_data = sys.stdin.read().strip()
-    if not input_data:
+    if not input_data or input_data.isspace():
         print("Error: stdin is empty")
         sys.exit(1)
 
@@ -305,8 +614,8 @@ def main() -> None:
     current_dir = os.path.basename(data["workspace"]["current_dir"])
     transcript_path = data["transcript_path"]
 
-    # Get Git branch
-    git_branch = get_git_branch()
+    # Get Git branch of the repository holding the workspace
+    git_branch = get_git_branch(data["workspace"]["current_dir"])
 
     # Parse transcript usage information
     (context_used_tokens, answer_timestamp, question_timestamp,
@@ -318,7 +627,8 @@ def main() -> None:
 
     # Calculate response duration
     response_duration = calculate_response_duration(answer_timestamp, question_timestamp)
-    readable_duration = time.strftime("%M:%S", time.gmtime(response_duration))
+    total_seconds = max(0, int(response_duration))
+    readable_duration = f"{total_seconds // 60:02d}:{total_seconds % 60:02d}"
 
     # Get base URL
     base_url = get_base_url() or "unknown"
@@ -327,17 +637,146 @@ def main() -> None:
     context_percentage = (context_used_tokens / CONTEXT_LIMIT) * 100
     color_code = get_context_color(context_percentage)
 
+    # Format context usage, colored only when needed
+    context_txt = f"{context_percentage:.1f}% ({context_used_tokens:,}/{CONTEXT_LIMIT_TXT} tokens)"
+    if color_code != COLOR_NONE:
+        context_txt = f"\033[{color_code}m{context_txt}\033[0m"
+
     # Format running status
     running_txt = " (running)" if is_running else ""
 
-    # Generate and print status line
-    print(
+    # Generate status line
+    return (
         f"[{model}@{base_url}] 📂 {current_dir}{git_branch} | "
-        f"📊 Context: "
-        f"\033[{color_code}m{context_percentage:.1f}% ({context_used_tokens:,}/{CONTEXT_LIMIT:,} tokens)\033[0m"
+        f"📊 Context: {context_txt}"
         f" | ⏱️ Answer duration: {readable_duration}{running_txt}"
     )
 
 
+class DaemonShutdown(BaseException):
+    """
+    Raised by the SIGTERM handler to stop the daemon.
+
+    It derives from BaseException so that the SystemExit and Exception
+    handlers around a request let it through.
+    """
+
+
+def handle_daemon_request(input_data: bytes) -> str:
+    """
+    Build the status line for one daemon client, turning errors into a reply.
+
+    Args:
+        input_data: Raw JSON bytes received on the socket
+
+    Returns:
+        Status line, or the error message that would have been printed
+    """
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        try:
+            return build_status_line(input_data)
+        except SystemExit:
+            pass
+        except Exception as e:
+            print(f"Error: {e}")
+    return output.getvalue().rstrip("\n")
+
+
+def run_daemon(socket_path: str) -> None:
+    """
+    Serve status lines on a Unix socket, keeping caches and imports warm.
+
+    Each client sends the JSON input and shuts down its writing side, then reads
+    the status line back, e.g. `nc -U -N <socket_path>`.
+
+    Args:
+        socket_path: Path of the Unix socket to listen on
+    """
+    import signal
+    import socket
+    import stat
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("Error: --daemon requires Unix socket support")
+        sys.exit(1)
+
+    # Only ever replace a stale socket: never another kind of file, nor a live daemon
+    try:
+        existing = os.lstat(socket_path)
+    except FileNotFoundError:
+        pass
+    else:
+        if not stat.S_ISSOCK(existing.st_mode):
+            print(f"Error: {socket_path} exists and is not a socket")
+            sys.exit(1)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(socket_path)
+            except OSError:
+                os.remove(socket_path)
+            else:
+                print(f"Error: a daemon is already listening on {socket_path}")
+                sys.exit(1)
+
+    def stop(signum: int, frame: Any) -> None:
+        raise DaemonShutdown
+
+    # Stop even in the middle of a request, and remove the socket below on exit
+    signal.signal(signal.SIGTERM, stop)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(socket_path)
+        bound_inode = os.lstat(socket_path).st_ino
+        try:
+            os.chmod(socket_path, 0o600)
+            server.listen()
+            while True:
+                conn, _ = server.accept()
+                with conn:
+                    try:
+                        conn.settimeout(DAEMON_CLIENT_TIMEOUT)
+                        chunks = []
+                        received = 0
+                        while received <= MAX_STDIN_SIZE:
+                            chunk = conn.recv(65536)
+                            if not chunk:
+                                break
+                            chunks.append(chunk)
+                            received += len(chunk)
+                        status_line = handle_daemon_request(b"".join(chunks))
+                        conn.sendall(status_line.encode("utf-8") + b"\n")
+                    except OSError:
+                        # Client went away or timed out: serve the next one
+                        pass
+        except DaemonShutdown:
+            pass
+        finally:
+            # Remove the socket only if it is still the one bound here
+            with contextlib.suppress(OSError):
+                if os.lstat(socket_path).st_ino == bound_inode:
+                    os.remove(socket_path)
+
+
+# Main execution starts here
+def main() -> None:
+    """
+    Main function to generate and print the status line.
+    """
+    if len(sys.argv) > 1 and sys.argv[1] == "--daemon":
+        # Ctrl+C is the normal way to stop a foreground daemon
+        with contextlib.suppress(KeyboardInterrupt):
+            run_daemon(sys.argv[2] if len(sys.argv) > 2 else DAEMON_SOCKET_PATH)
+        return
+
+    # Read raw bytes: the JSON parser decodes them, and reading one byte past
+    # the limit is enough to reject oversized input
+    input_data = sys.stdin.buffer.read(MAX_STDIN_SIZE + 1)
+    status_line = build_status_line(input_data)
+
+    # Encode to UTF-8 ourselves (emojis) rather than rewrapping sys.stdout
+    sys.stdout.buffer.write(status_line.encode("utf-8") + os.linesep.encode("ascii"))
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file